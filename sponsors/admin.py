@@ -1,21 +1,43 @@
+import logging
+
 from django.contrib.contenttypes.admin import GenericTabularInline
 from ordered_model.admin import OrderedModelAdmin
 from polymorphic.admin import PolymorphicInlineSupportMixin, StackedPolymorphicInline
+from sorl.thumbnail import get_thumbnail
 
-from django.db.models import Subquery
-from django.template import Context, Template
+from django.db.models import Exists, OuterRef, Sum
 from django.contrib import admin
 from django.contrib.humanize.templatetags.humanize import intcomma
-from django.urls import path, reverse, resolve
+from django.urls import path, resolve
 from django.utils.functional import cached_property
-from django.utils.html import mark_safe
+from django.utils.html import format_html, format_html_join, mark_safe
 
 from mailing.admin import BaseEmailTemplateAdmin
 from sponsors.models import *
+from sponsors.models.sponsorship import get_targetable_email_benefits
 from sponsors import views_admin
+from sponsors.utils import get_admin_url
 from sponsors.forms import SponsorshipReviewAdminForm, SponsorBenefitAdminInlineForm, RequiredImgAssetConfigurationForm
 from cms.admin import ContentManageableModelAdmin
 
+log = logging.getLogger(__name__)
+
+
+def get_logo_thumbnail_html(img):
+    """
+    Renders a 150x150 PNG thumbnail as an <img> tag. As the {% thumbnail %}
+    template tag, it returns an empty string if there's no image or if the
+    thumbnail can't be generated.
+    """
+    if not img:
+        return ""
+    try:
+        im = get_thumbnail(img, "150x150", format="PNG", quality=100)
+    except Exception:
+        log.exception("Thumbnail generation failed for %s", img)
+        return ""
+    return format_html("<img src='{}'/>", im.url)
+
 
 class AssetsInline(GenericTabularInline):
     model = GenericAsset
@@ -24,6 +46,11 @@ class AssetsInline(GenericTabularInline):
     has_delete_permission = lambda self, request, obj: False
     readonly_fields = ["internal_name", "user_submitted_info", "value"]
 
+    def get_queryset(self, *args, **kwargs):
+        # explicit ordering keeps the inline rows in a stable order
+        qs = super().get_queryset(*args, **kwargs)
+        return qs.order_by("id")
+
     def value(self, request, obj=None):
         if not obj or not obj.value:
             return ""
@@ -75,6 +102,12 @@ class BenefitFeatureConfigurationInline(StackedPolymorphicInline):
         RequiredTextAssetConfigurationInline,
     ]
 
+    def get_queryset(self, request):
+        # the polymorphic queryset fetches each child type in a single query and
+        # keeps select_related, so the configurations' __str__ won't hit the db per row
+        qs = super().get_queryset(request)
+        return qs.select_related("benefit__program")
+
 
 @admin.register(SponsorshipBenefit)
 class SponsorshipBenefitAdmin(PolymorphicInlineSupportMixin, OrderedModelAdmin):
@@ -171,7 +204,12 @@ class SponsorBenefitInline(admin.TabularInline):
         has_add_permission = super().has_add_permission(request, obj=obj)
         match = request.resolver_match
         if match.url_name == "sponsors_sponsorship_change":
-            sponsorship = self.parent_model.objects.get(pk=match.kwargs["object_id"])
+            # Django checks this permission several times while rendering
+            # the change form, so the sponsorship is fetched once per request
+            sponsorship = getattr(request, "_inline_parent_sponsorship", None)
+            if sponsorship is None:
+                sponsorship = self.parent_model.objects.only("status").get(pk=match.kwargs["object_id"])
+                request._inline_parent_sponsorship = sponsorship
             has_add_permission = has_add_permission and sponsorship.open_for_editing
         return has_add_permission
 
@@ -196,23 +234,25 @@ class TargetableEmailBenefitsFilter(admin.SimpleListFilter):
 
     @cached_property
     def benefits(self):
-        qs = EmailTargetableConfiguration.objects.all().values_list("benefit_id", flat=True)
-        benefits = SponsorshipBenefit.objects.filter(id__in=Subquery(qs))
-        return {str(b.id): b for b in benefits}
+        return get_targetable_email_benefits()
 
     def lookups(self, request, model_admin):
-        return [
-            (k, b.name) for k, b in self.benefits.items()
-        ]
+        return list(self.benefits.items())
 
     def queryset(self, request, queryset):
-        benefit = self.benefits.get(self.value())
-        if not benefit:
+        # the cached benefits may be stale in other processes, so they're only
+        # used as the lookups and the filter always uses the requested benefit
+        try:
+            benefit_id = int(self.value())
+        except (TypeError, ValueError):
             return queryset
-        # all sponsors benefit related with such sponsorship benefit
-        qs = SponsorBenefit.objects.filter(
-            sponsorship_benefit_id=benefit.id).values_list("sponsorship_id", flat=True)
-        return queryset.filter(id__in=Subquery(qs))
+        # all sponsorships with a sponsor benefit related with such sponsorship benefit
+        sponsor_benefits = SponsorBenefit.objects.filter(
+            sponsorship=OuterRef("pk"), sponsorship_benefit_id=benefit_id
+        )
+        return queryset.annotate(
+            has_email_benefit=Exists(sponsor_benefits)
+        ).filter(has_email_benefit=True)
 
 
 @admin.register(Sponsorship)
@@ -279,9 +319,25 @@ class SponsorshipAdmin(admin.ModelAdmin):
         ),
     ]
 
-    def get_queryset(self, *args, **kwargs):
-        qs = super().get_queryset(*args, **kwargs)
-        return qs.select_related("sponsor", "package", "submited_by")
+    def get_queryset(self, request, *args, **kwargs):
+        qs = super().get_queryset(request, *args, **kwargs)
+        match = request.resolver_match
+        if request.method == "GET" and match and match.url_name == "sponsors_sponsorship_changelist":
+            # the changelist only displays a few columns
+            return qs.select_related("sponsor", "package").only(
+                "status",
+                "applied_on",
+                "approved_on",
+                "start_date",
+                "end_date",
+                "sponsor__name",
+                "package__name",
+            )
+        qs = qs.select_related("sponsor", "package", "submited_by", "contract")
+        qs = qs.prefetch_related("sponsor__contacts")
+        if match and match.url_name == "sponsors_sponsorship_change":
+            qs = qs.annotate(_estimated_cost=Sum("benefits__benefit_internal_value"))
+        return qs
 
     def send_notifications(self, request, queryset):
         return views_admin.send_sponsorship_notifications_action(self, request, queryset)
@@ -320,7 +376,10 @@ class SponsorshipAdmin(admin.ModelAdmin):
         html = "This sponsorship has not customizations so there's no estimated cost"
         if obj.for_modified_package:
             msg = "This sponsorship has customizations and this cost is a sum of all benefit's internal values from when this sponsorship was created"
-            cost = intcomma(obj.estimated_cost)
+            if hasattr(obj, "_estimated_cost"):
+                cost = intcomma(obj._estimated_cost or 0)
+            else:
+                cost = intcomma(obj.estimated_cost)
             html = f"{cost} USD <br/><b>Important: </b> {msg}"
         return mark_safe(html)
 
@@ -329,9 +388,8 @@ class SponsorshipAdmin(admin.ModelAdmin):
     def get_contract(self, obj):
         if not obj.contract:
             return "---"
-        url = reverse("admin:sponsors_contract_change", args=[obj.contract.pk])
-        html = f"<a href='{url}' target='_blank'>{obj.contract}</a>"
-        return mark_safe(html)
+        url = get_admin_url("admin:sponsors_contract_change", obj.contract.pk)
+        return format_html("<a href='{}' target='_blank'>{}</a>", url, obj.contract)
 
     get_contract.short_description = "Contract"
 
@@ -360,9 +418,21 @@ class SponsorshipAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.rollback_to_editing_view),
                 name="sponsors_sponsorship_rollback_to_edit",
             ),
+            path(
+                "<int:pk>/benefits-partial",
+                self.admin_site.admin_view(self.list_benefits_view),
+                name="sponsors_sponsorship_benefits_partial",
+            ),
         ]
         return my_urls + urls
 
+    def get_inline_instances(self, request, obj=None):
+        inlines = super().get_inline_instances(request, obj=obj)
+        if obj and not obj.open_for_editing:
+            # benefits are read-only, so the change form lazy loads them instead
+            inlines = [i for i in inlines if not isinstance(i, SponsorBenefitInline)]
+        return inlines
+
     def get_sponsor_name(self, obj):
         return obj.sponsor.name
 
@@ -379,23 +449,13 @@ class SponsorshipAdmin(admin.ModelAdmin):
     get_sponsor_landing_page_url.short_description = "Landing Page URL"
 
     def get_sponsor_web_logo(self, obj):
-        html = "{% load thumbnail %}{% thumbnail sponsor.web_logo '150x150' format='PNG' quality=100 as im %}<img src='{{ im.url}}'/>{% endthumbnail %}"
-        template = Template(html)
-        context = Context({'sponsor': obj.sponsor})
-        html = template.render(context)
-        return mark_safe(html)
+        return get_logo_thumbnail_html(obj.sponsor.web_logo)
 
     get_sponsor_web_logo.short_description = "Web Logo"
 
     def get_sponsor_print_logo(self, obj):
-        img = obj.sponsor.print_logo
-        html = ""
-        if img:
-            html = "{% load thumbnail %}{% thumbnail img '150x150' format='PNG' quality=100 as im %}<img src='{{ im.url}}'/>{% endthumbnail %}"
-            template = Template(html)
-            context = Context({'img': img})
-            html = template.render(context)
-        return mark_safe(html) if html else "---"
+        html = get_logo_thumbnail_html(obj.sponsor.print_logo)
+        return html or "---"
 
     get_sponsor_print_logo.short_description = "Print Logo"
 
@@ -406,40 +466,35 @@ class SponsorshipAdmin(admin.ModelAdmin):
 
     def get_sponsor_mailing_address(self, obj):
         sponsor = obj.sponsor
+        # Country.name is a dict lookup while get_country_display() rebuilds the choices mapping
+        country_name = sponsor.country.name
         city_row = (
-            f"{sponsor.city} - {sponsor.get_country_display()} ({sponsor.country})"
+            f"{sponsor.city} - {country_name} ({sponsor.country})"
         )
         if sponsor.state:
-            city_row = f"{sponsor.city} - {sponsor.state} - {sponsor.get_country_display()} ({sponsor.country})"
+            city_row = f"{sponsor.city} - {sponsor.state} - {country_name} ({sponsor.country})"
 
         mail_row = sponsor.mailing_address_line_1
         if sponsor.mailing_address_line_2:
             mail_row += f" - {sponsor.mailing_address_line_2}"
 
-        html = f"<p>{city_row}</p>"
-        html += f"<p>{mail_row}</p>"
-        html += f"<p>{sponsor.postal_code}</p>"
-        return mark_safe(html)
+        return format_html("<p>{}</p><p>{}</p><p>{}</p>", city_row, mail_row, sponsor.postal_code)
 
     get_sponsor_mailing_address.short_description = "Mailing/Billing Address"
 
     def get_sponsor_contacts(self, obj):
+        primary, not_primary = [], []
+        for c in obj.sponsor.contacts.all():
+            (primary if c.primary else not_primary).append((c.name, c.email, c.phone))
+
         html = ""
-        contacts = obj.sponsor.contacts.all()
-        primary = [c for c in contacts if c.primary]
-        not_primary = [c for c in contacts if not c.primary]
+        item_format = "<li>{}: {} / {}</li>"
         if primary:
-            html = "<b>Primary contacts</b><ul>"
-            html += "".join(
-                [f"<li>{c.name}: {c.email} / {c.phone}</li>" for c in primary]
-            )
-            html += "</ul>"
+            items = format_html_join("", item_format, primary)
+            html += format_html("<b>Primary contacts</b><ul>{}</ul>", items)
         if not_primary:
-            html += "<b>Other contacts</b><ul>"
-            html += "".join(
-                [f"<li>{c.name}: {c.email} / {c.phone}</li>" for c in not_primary]
-            )
-            html += "</ul>"
+            items = format_html_join("", item_format, not_primary)
+            html += format_html("<b>Other contacts</b><ul>{}</ul>", items)
         return mark_safe(html)
 
     get_sponsor_contacts.short_description = "Contacts"
@@ -456,6 +511,9 @@ class SponsorshipAdmin(admin.ModelAdmin):
     def approve_signed_sponsorship_view(self, request, pk):
         return views_admin.approve_signed_sponsorship_view(self, request, pk)
 
+    def list_benefits_view(self, request, pk):
+        return views_admin.list_sponsorship_benefits_view(self, request, pk)
+
 
 @admin.register(LegalClause)
 class LegalClauseModelAdmin(OrderedModelAdmin):
@@ -475,9 +533,28 @@ class ContractModelAdmin(admin.ModelAdmin):
         "document_link",
     ]
 
-    def get_queryset(self, *args, **kwargs):
-        qs = super().get_queryset(*args, **kwargs)
-        return qs.select_related("sponsorship__sponsor")
+    def get_queryset(self, request, *args, **kwargs):
+        qs = super().get_queryset(request, *args, **kwargs)
+        qs = qs.select_related("sponsorship__sponsor")
+        match = request.resolver_match
+        if request.method == "GET" and match and match.url_name == "sponsors_contract_changelist":
+            # the changelist only displays a few columns, but the
+            # sponsorship's representation depends on its package
+            return qs.select_related("sponsorship__package").only(
+                "status",
+                "created_on",
+                "last_update",
+                "revision",
+                "document",
+                "signed_document",
+                "sponsorship__status",
+                "sponsorship__start_date",
+                "sponsorship__end_date",
+                "sponsorship__level_name_old",
+                "sponsorship__sponsor__name",
+                "sponsorship__package__name",
+            )
+        return qs
 
     def get_revision(self, obj):
         return obj.revision if obj.is_draft else "Final"
@@ -564,17 +641,16 @@ class ContractModelAdmin(admin.ModelAdmin):
             msg = "Download Signed Contract"
 
         if url and msg:
-            html = f'<a href="{url}" target="_blank">{msg}</a>'
-        return mark_safe(html)
+            html = format_html('<a href="{}" target="_blank">{}</a>', url, msg)
+        return html
 
     document_link.short_description = "Contract document"
 
     def get_sponsorship_url(self, obj):
         if not obj.sponsorship:
             return "---"
-        url = reverse("admin:sponsors_sponsorship_change", args=[obj.sponsorship.pk])
-        html = f"<a href='{url}' target='_blank'>{obj.sponsorship}</a>"
-        return mark_safe(html)
+        url = get_admin_url("admin:sponsors_sponsorship_change", obj.sponsorship.pk)
+        return format_html("<a href='{}' target='_blank'>{}</a>", url, obj.sponsorship)
 
     get_sponsorship_url.short_description = "Sponsorship"
 
@@ -331,7 +331,7 @@ class SponsorshipApplicationForm(forms.Form):
             if self.user and self.user.email.lower() == contact.email.lower():
                 contact.user = self.user
             contact.sponsor = sponsor
-            contact.save()
+        SponsorContact.objects.bulk_create(contacts)
 
         return sponsor
 
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.24 on 2026-10-15 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sponsors', '0062_auto_20211111_1529'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sponsorship',
+            index=models.Index(fields=['status', 'package'], name='sponsors_sp_status_9ae41c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sponsorship',
+            index=models.Index(fields=['applied_on'], name='sponsors_sp_applied_29795e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sponsorshipbenefit',
+            index=models.Index(fields=['program', 'order'], name='sponsors_sp_program_464be6_idx'),
+        ),
+    ]
@@ -6,13 +6,12 @@ from itertools import chain
 from pathlib import Path
 
 from django.db import models
-from django.urls import reverse
 from django.utils import timezone
 from markupfield.fields import MarkupField
 from ordered_model.models import OrderedModel
 
 from sponsors.exceptions import InvalidStatusException
-from sponsors.utils import file_from_storage
+from sponsors.utils import file_from_storage, get_admin_url
 from sponsors.models.sponsorship import Sponsorship
 
 
@@ -184,7 +183,7 @@ class Contract(models.Model):
 
     @property
     def preview_url(self):
-        return reverse("admin:sponsors_contract_preview", args=[self.pk])
+        return get_admin_url("admin:sponsors_contract_preview", self.pk)
 
     @property
     def awaiting_signature(self):
@@ -6,9 +6,12 @@ from itertools import chain
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
 from django.db.models import Subquery, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.template.defaultfilters import truncatechars
 from django.urls import reverse
 from django.utils import timezone
@@ -21,7 +24,7 @@ from sponsors.exceptions import SponsorWithExistingApplicationException, Invalid
     SponsorshipInvalidDateRangeException
 from sponsors.models.assets import GenericAsset
 from sponsors.models.managers import SponsorshipPackageManager, SponsorshipBenefitManager, SponsorshipQuerySet
-from sponsors.models.benefits import TieredQuantityConfiguration
+from sponsors.models.benefits import TieredQuantityConfiguration, EmailTargetableConfiguration
 from sponsors.models.sponsors import SponsorBenefit
 
 
@@ -145,6 +148,11 @@ class Sponsorship(models.Model):
         permissions = [
             ("sponsor_publisher", "Can access sponsor placement API"),
         ]
+        # indexes for the admin changelist filters and sorting
+        indexes = [
+            models.Index(fields=["status", "package"]),
+            models.Index(fields=["applied_on"]),
+        ]
 
     @property
     def level_name(self):
@@ -466,4 +474,36 @@ class SponsorshipBenefit(OrderedModel):
         return self.features_config.instance_of(TieredQuantityConfiguration).count() > 0
 
     class Meta(OrderedModel.Meta):
-        pass
+        # the admin lists benefits ordered by program and order
+        indexes = [
+            models.Index(fields=["program", "order"]),
+        ]
+
+
+TARGETABLE_EMAIL_BENEFITS_CACHE_KEY = "sponsors:targetable_email_benefits"
+
+
+def get_targetable_email_benefits():
+    """
+    Returns a dict with the names of the benefits with email targetable
+    configuration indexed by the benefits ids as strings.
+
+    Saving or deleting benefits or configurations clears the cached value. If
+    the cache backend is local to the process, such as the default LocMemCache,
+    only the current process is cleared and the others keep the previous value
+    until it expires.
+    """
+    def fetch():
+        qs = EmailTargetableConfiguration.objects.values_list("benefit_id", flat=True)
+        benefits = SponsorshipBenefit.objects.filter(id__in=Subquery(qs))
+        return {str(b_id): name for b_id, name in benefits.values_list("id", "name")}
+
+    return cache.get_or_set(TARGETABLE_EMAIL_BENEFITS_CACHE_KEY, fetch, 60 * 5)
+
+
+@receiver(post_save, sender=EmailTargetableConfiguration)
+@receiver(post_delete, sender=EmailTargetableConfiguration)
+@receiver(post_save, sender=SponsorshipBenefit)
+@receiver(post_delete, sender=SponsorshipBenefit)
+def clear_targetable_email_benefits_cache(sender, **kwargs):
+    cache.delete(TARGETABLE_EMAIL_BENEFITS_CACHE_KEY)
@@ -0,0 +1,153 @@
+from model_bakery import baker
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse, resolve
+
+from ..admin import SponsorshipAdmin, TargetableEmailBenefitsFilter
+from ..models import Sponsorship, SponsorContact, SponsorBenefit, SponsorshipBenefit, EmailTargetableConfiguration
+from ..models.sponsorship import TARGETABLE_EMAIL_BENEFITS_CACHE_KEY
+
+
+class SponsorshipAdminReadonlyFieldsTests(TestCase):
+    """
+    The sponsor readonly fields from the change form must be fully
+    served by the select/prefetch related data from get_queryset
+    """
+
+    def setUp(self):
+        self.sponsorship = baker.make(
+            Sponsorship,
+            for_modified_package=True,
+            sponsor__name="Foo",
+            sponsor__city="Sao Paulo",
+            sponsor__country="BR",
+        )
+        sponsor = self.sponsorship.sponsor
+        baker.make(SponsorContact, sponsor=sponsor, name="Primary", primary=True)
+        baker.make(SponsorContact, sponsor=sponsor, name="Other", primary=False)
+        baker.make(
+            SponsorBenefit,
+            sponsorship=self.sponsorship,
+            benefit_internal_value=1000,
+            _quantity=2,
+        )
+        self.model_admin = SponsorshipAdmin(Sponsorship, admin.site)
+
+        url = reverse("admin:sponsors_sponsorship_change", args=[self.sponsorship.pk])
+        self.request = RequestFactory().get(url)
+        self.request.resolver_match = resolve(url)
+        self.obj = self.model_admin.get_queryset(self.request).get(pk=self.sponsorship.pk)
+
+    def test_get_sponsor_contacts_without_extra_queries(self):
+        with self.assertNumQueries(0):
+            html = self.model_admin.get_sponsor_contacts(self.obj)
+
+        self.assertIn("<b>Primary contacts</b><ul><li>Primary:", html)
+        self.assertIn("<b>Other contacts</b><ul><li>Other:", html)
+
+    def test_get_sponsor_mailing_address_without_extra_queries(self):
+        with self.assertNumQueries(0):
+            html = self.model_admin.get_sponsor_mailing_address(self.obj)
+
+        self.assertIn("<p>Sao Paulo - Brazil (BR)</p>", html)
+
+    def test_get_estimated_cost_without_extra_queries(self):
+        with self.assertNumQueries(0):
+            html = self.model_admin.get_estimated_cost(self.obj)
+
+        self.assertIn("2,000 USD", html)
+
+
+class SponsorshipAdminChangelistQuerysetTests(TestCase):
+
+    def setUp(self):
+        self.model_admin = SponsorshipAdmin(Sponsorship, admin.site)
+        url = reverse("admin:sponsors_sponsorship_changelist")
+        self.request = RequestFactory().get(url)
+        self.request.resolver_match = resolve(url)
+
+    def test_only_join_displayed_relations(self):
+        qs = self.model_admin.get_queryset(self.request)
+
+        self.assertEqual({"sponsor": {}, "package": {}}, qs.query.select_related)
+
+    def test_do_not_load_submitter(self):
+        user = baker.make(settings.AUTH_USER_MODEL)
+        baker.make(Sponsorship, submited_by=user, _quantity=2)
+
+        sponsorships = list(self.model_admin.get_queryset(self.request))
+
+        self.assertEqual(2, len(sponsorships))
+        for sponsorship in sponsorships:
+            self.assertIn("submited_by_id", sponsorship.get_deferred_fields())
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TargetableEmailBenefitsFilterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.benefit = baker.make(SponsorshipBenefit, name="Newsletter")
+        baker.make(EmailTargetableConfiguration, benefit=self.benefit)
+        self.sponsorship = baker.make(Sponsorship)
+        baker.make(SponsorBenefit, sponsorship=self.sponsorship, sponsorship_benefit=self.benefit)
+        baker.make(Sponsorship)
+        self.model_admin = SponsorshipAdmin(Sponsorship, admin.site)
+        self.request = RequestFactory().get("/")
+
+    def tearDown(self):
+        cache.clear()
+
+    def get_filter(self, value=None):
+        params = {} if value is None else {"email_benefit": value}
+        return TargetableEmailBenefitsFilter(self.request, params, Sponsorship, self.model_admin)
+
+    def test_lookups_with_targetable_benefits(self):
+        list_filter = self.get_filter()
+        self.assertEqual([(str(self.benefit.pk), "Newsletter")], list_filter.lookup_choices)
+
+    def test_filter_sponsorships_with_selected_benefit(self):
+        list_filter = self.get_filter(str(self.benefit.pk))
+
+        qs = list_filter.queryset(self.request, Sponsorship.objects.all())
+
+        self.assertEqual([self.sponsorship], list(qs))
+
+    def test_do_not_filter_if_invalid_benefit_id(self):
+        list_filter = self.get_filter("foo")
+
+        qs = list_filter.queryset(self.request, Sponsorship.objects.all())
+
+        self.assertEqual(2, qs.count())
+
+    def test_filter_by_unknown_benefit_returns_no_sponsorship(self):
+        list_filter = self.get_filter("0")
+
+        qs = list_filter.queryset(self.request, Sponsorship.objects.all())
+
+        self.assertEqual(0, qs.count())
+
+    def test_filter_sponsorships_even_if_cached_benefits_are_stale(self):
+        # another process added the benefit after this one cached the benefits
+        cache.set(TARGETABLE_EMAIL_BENEFITS_CACHE_KEY, {})
+        list_filter = self.get_filter(str(self.benefit.pk))
+
+        qs = list_filter.queryset(self.request, Sponsorship.objects.all())
+
+        self.assertEqual([], list_filter.lookup_choices)
+        self.assertEqual([self.sponsorship], list(qs))
+
+    def test_reuse_cached_benefits(self):
+        # lookups and queryset share the benefits fetched for the request
+        with self.assertNumQueries(1):
+            list_filter = self.get_filter(str(self.benefit.pk))
+            list_filter.queryset(self.request, Sponsorship.objects.all())
+
+        # following requests read them from the cache
+        with self.assertNumQueries(0):
+            list_filter = self.get_filter(str(self.benefit.pk))
+            list_filter.queryset(self.request, Sponsorship.objects.all())
+
@@ -1,7 +1,7 @@
 from model_bakery import baker
 
 from django.conf import settings
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from sponsors.forms import (
     SponsorshiptBenefitsForm,
@@ -21,66 +21,77 @@ from .utils import get_static_image_file_as_upload
 from ..models.enums import AssetsRelatedTo
 
 
+def ids(objs):
+    return {obj.pk for obj in objs}
+
+
 class SponsorshiptBenefitsFormTests(TestCase):
-    def setUp(self):
-        self.psf = baker.make("sponsors.SponsorshipProgram", name="PSF")
-        self.wk = baker.make("sponsors.SponsorshipProgram", name="Working Group")
-        self.program_1_benefits = baker.make(
-            SponsorshipBenefit, program=self.psf, _quantity=3
+    @classmethod
+    def setUpTestData(cls):
+        cls.psf = baker.make("sponsors.SponsorshipProgram", name="PSF")
+        cls.wk = baker.make("sponsors.SponsorshipProgram", name="Working Group")
+        cls.program_1_benefits = baker.make(
+            SponsorshipBenefit, program=cls.psf, _quantity=3, _bulk_create=True
         )
-        self.program_2_benefits = baker.make(
-            SponsorshipBenefit, program=self.wk, _quantity=5
+        cls.program_2_benefits = baker.make(
+            SponsorshipBenefit, program=cls.wk, _quantity=5, _bulk_create=True
         )
-        self.package = baker.make("sponsors.SponsorshipPackage", advertise=True)
-        self.package.benefits.add(*self.program_1_benefits)
-        self.package.benefits.add(*self.program_2_benefits)
+        cls.package = baker.make("sponsors.SponsorshipPackage", advertise=True)
+        cls.package.benefits.add(*cls.program_1_benefits, *cls.program_2_benefits)
 
         # packages without associated packages
-        self.add_ons = baker.make(SponsorshipBenefit, program=self.psf, _quantity=2)
+        cls.add_ons = baker.make(SponsorshipBenefit, program=cls.psf, _quantity=2, _bulk_create=True)
+
+        # only for tests which don't change the fixtures before inspecting the form
+        cls._unbound_form = cls._make_form()
+
+    @classmethod
+    def _make_form(cls, data=None):
+        return SponsorshiptBenefitsForm(data=data)
 
     def test_benefits_organized_by_program(self):
-        form = SponsorshiptBenefitsForm()
+        form = self._unbound_form
 
         choices = list(form.fields["add_ons_benefits"].choices)
+        choice_ids = {c[0] for c in choices}
 
         self.assertEqual(len(self.add_ons), len(choices))
-        for benefit in self.add_ons:
-            self.assertIn(benefit.id, [c[0] for c in choices])
+        self.assertLessEqual(ids(self.add_ons), choice_ids)
 
     def test_specific_field_to_select_add_ons(self):
-        form = SponsorshiptBenefitsForm()
+        form = self._unbound_form
 
         field1, field2 = sorted(form.benefits_programs, key=lambda f: f.name)
 
         self.assertEqual("benefits_psf", field1.name)
         self.assertEqual("PSF Benefits", field1.label)
         choices = list(field1.field.choices)
+        choice_ids = {c[0] for c in choices}
         self.assertEqual(len(self.program_1_benefits), len(choices))
-        for benefit in self.program_1_benefits:
-            self.assertIn(benefit.id, [c[0] for c in choices])
+        self.assertLessEqual(ids(self.program_1_benefits), choice_ids)
 
         self.assertEqual("benefits_working_group", field2.name)
         self.assertEqual("Working Group Benefits", field2.label)
         choices = list(field2.field.choices)
+        choice_ids = {c[0] for c in choices}
         self.assertEqual(len(self.program_2_benefits), len(choices))
-        for benefit in self.program_2_benefits:
-            self.assertIn(benefit.id, [c[0] for c in choices])
+        self.assertLessEqual(ids(self.program_2_benefits), choice_ids)
 
     def test_package_list_only_advertisable_ones(self):
         ads_pkgs = baker.make('SponsorshipPackage', advertise=True, _quantity=2)
         baker.make('SponsorshipPackage', advertise=False)
 
-        form = SponsorshiptBenefitsForm()
+        form = self._make_form()
         field = form.fields.get("package")
 
         self.assertEqual(3, field.queryset.count())
 
     def test_invalidate_form_without_benefits(self):
-        form = SponsorshiptBenefitsForm(data={})
+        form = self._make_form(data={})
         self.assertFalse(form.is_valid())
         self.assertIn("__all__", form.errors)
 
-        form = SponsorshiptBenefitsForm(
+        form = self._make_form(
             data={"benefits_psf": [self.program_1_benefits[0].id]}
         )
         self.assertTrue(form.is_valid())
@@ -90,7 +101,7 @@ class SponsorshiptBenefitsFormTests(TestCase):
         benefit_1.conflicts.add(*self.program_1_benefits)
         benefit_2.conflicts.add(*self.program_2_benefits)
 
-        form = SponsorshiptBenefitsForm()
+        form = self._make_form()
         map = form.benefits_conflicts
 
         # conflicts are symmetrical relationships
@@ -114,11 +125,11 @@ class SponsorshiptBenefitsFormTests(TestCase):
         self.package.benefits.add(benefit_1)
 
         data = {"benefits_psf": [b.id for b in self.program_1_benefits]}
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertTrue(form.is_valid())
 
         data["benefits_working_group"] = [benefit_1.id]
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertFalse(form.is_valid())
         self.assertIn(
             "The application has 1 or more benefits that conflicts.",
@@ -130,7 +141,7 @@ class SponsorshiptBenefitsFormTests(TestCase):
 
         data = {"benefits_psf": [benefit.id],
                 "add_ons_benefits": [b.id for b in self.add_ons]}
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertTrue(form.is_valid())
 
         benefits = form.get_benefits()
@@ -140,15 +151,14 @@ class SponsorshiptBenefitsFormTests(TestCase):
         benefits = form.get_benefits(include_add_ons=True)
         self.assertEqual(3, len(benefits))
         self.assertIn(benefit, benefits)
-        for add_on in self.add_ons:
-            self.assertIn(add_on, benefits)
+        self.assertLessEqual(ids(self.add_ons), ids(benefits))
 
     def test_package_only_benefit_without_package_should_not_validate(self):
         SponsorshipBenefit.objects.all().update(package_only=True)
 
         data = {"benefits_psf": [self.program_1_benefits[0]]}
 
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertFalse(form.is_valid())
         self.assertIn(
             "The application has 1 or more package only benefits and no sponsor package.",
@@ -158,14 +168,14 @@ class SponsorshiptBenefitsFormTests(TestCase):
     def test_package_only_benefit_with_wrong_package_should_not_validate(self):
         SponsorshipBenefit.objects.all().update(package_only=True)
         package = baker.make("sponsors.SponsorshipPackage", advertise=True)
-        package.benefits.add(*SponsorshipBenefit.objects.all())
+        package.benefits.add(*self.program_1_benefits, *self.program_2_benefits, *self.add_ons)
 
         data = {
             "benefits_psf": [self.program_1_benefits[0]],
             "package": baker.make("sponsors.SponsorshipPackage", advertise=True).id,  # other package
         }
 
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertFalse(form.is_valid())
         self.assertIn(
             "The application has 1 or more package only benefits but wrong sponsor package.",
@@ -176,7 +186,7 @@ class SponsorshiptBenefitsFormTests(TestCase):
             "benefits_psf": [self.program_1_benefits[0]],
             "package": package.id,
         }
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertTrue(form.is_valid())
 
     def test_benefit_with_no_capacity_should_not_validate(self):
@@ -184,7 +194,7 @@ class SponsorshiptBenefitsFormTests(TestCase):
 
         data = {"benefits_psf": [self.program_1_benefits[0]]}
 
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertFalse(form.is_valid())
         self.assertIn(
             "The application has 1 or more benefits with no capacity.",
@@ -196,7 +206,7 @@ class SponsorshiptBenefitsFormTests(TestCase):
 
         data = {"benefits_psf": [self.program_1_benefits[0]]}
 
-        form = SponsorshiptBenefitsForm(data=data)
+        form = self._make_form(data=data)
         self.assertTrue(form.is_valid())
 
 
@@ -253,9 +263,11 @@ class SponsorshipApplicationFormTests(TestCase):
     def test_create_sponsor_with_valid_data(self):
         user = baker.make(settings.AUTH_USER_MODEL)
         form = SponsorshipApplicationForm(self.data, self.files, user=user)
-        self.assertTrue(form.is_valid(), form.errors)
 
-        sponsor = form.save()
+        # one insert for the sponsor and another one for its contacts
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid(), form.errors)
+            sponsor = form.save()
 
         self.assertTrue(sponsor.pk)
         self.assertEqual(sponsor.name, "CompanyX")
@@ -309,7 +321,7 @@ class SponsorshipApplicationFormTests(TestCase):
         self.assertTrue(form.user_with_previous_sponsors)
         self.assertEqual(saved_sponsor, contact.sponsor)
         self.assertEqual(Sponsor.objects.count(), 1)
-        self.assertEqual(saved_sponsor.contacts.get(), contact)
+        self.assertEqual(saved_sponsor.contacts.select_related("user").get(), contact)
 
     def test_invalidate_form_if_user_selects_sponsort_from_other_user(self):
         contact = baker.make(SponsorContact, user__email="foo@foo.com")
@@ -349,12 +361,14 @@ class SponsorshipApplicationFormTests(TestCase):
         )
         user = baker.make(settings.AUTH_USER_MODEL, email=user_email.upper())
         form = SponsorshipApplicationForm(self.data, self.files, user=user)
-        self.assertTrue(form.is_valid(), form.errors)
 
-        sponsor = form.save()
+        # the number of queries doesn't grow with the number of contacts
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid(), form.errors)
+            sponsor = form.save()
 
         self.assertEqual(2, sponsor.contacts.count())
-        c1, c2 = sorted(sponsor.contacts.all(), key=lambda c: c.name)
+        c1, c2 = sponsor.contacts.select_related("user").order_by("name")
         self.assertEqual(c1.name, "Bernardo")
         self.assertTrue(c1.primary)  # first contact should be the primary one
         self.assertIsNone(c1.user)
@@ -396,10 +410,12 @@ class SponsorContactFormSetTests(TestCase):
 
         formset = SponsorContactFormSet(self.data, prefix="contact")
         self.assertTrue(formset.is_valid())
+        contacts = []
         for form in formset.forms:
             contact = form.save(commit=False)
             contact.sponsor = sponsor
-            contact.save()
+            contacts.append(contact)
+        SponsorContact.objects.bulk_create(contacts)
 
         self.assertEqual(2, SponsorContact.objects.count())
 
@@ -410,9 +426,12 @@ class SponsorContactFormSetTests(TestCase):
 
 
 class SponsorBenefitAdminInlineFormTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.benefit = baker.make(SponsorshipBenefit)
+        cls.sponsorship = baker.make(Sponsorship)
+
     def setUp(self):
-        self.benefit = baker.make(SponsorshipBenefit)
-        self.sponsorship = baker.make(Sponsorship)
         self.data = {
             "sponsorship_benefit": self.benefit.pk,
             "sponsorship": self.sponsorship.pk,
@@ -478,8 +497,7 @@ class SponsorBenefitAdminInlineFormTests(TestCase):
         self.assertTrue(form.is_valid(), form.errors)
         form.save()
         sponsor_benefit.refresh_from_db()
-        self.benefit.name = "new name"
-        self.benefit.save()
+        SponsorshipBenefit.objects.filter(pk=self.benefit.pk).update(name="new name")
 
         self.assertEqual(1, SponsorBenefit.objects.count())
         self.assertEqual(sponsor_benefit.sponsorship, self.sponsorship)
@@ -497,7 +515,7 @@ class SponsorBenefitAdminInlineFormTests(TestCase):
         baker.make_recipe('sponsors.tests.logo_at_download_feature', sponsor_benefit=sponsor_benefit)
 
         # new benefit requires text instead of logo
-        new_benefit = baker.make(SponsorshipBenefit)
+        new_benefit = baker.make(SponsorshipBenefit, program=self.benefit.program)
         baker.make(RequiredTextAssetConfiguration, benefit=new_benefit, internal_name='foo',
                    related_to=AssetsRelatedTo.SPONSORSHIP.value)
         self.data["sponsorship_benefit"] = new_benefit.pk
@@ -514,14 +532,16 @@ class SponsorBenefitAdminInlineFormTests(TestCase):
 class SponsorshipsFormTestCase(TestCase):
 
     def test_list_all_sponsorships_as_choices_by_default(self):
-        sponsorships = baker.make(Sponsorship, _quantity=3)
+        sponsorships = baker.make(Sponsorship, _quantity=3, _bulk_create=True)
 
         form = SponsorshipsListForm()
         qs = form.fields["sponsorships"].queryset
 
-        self.assertEqual(3, qs.count())
-        for sponsorship in sponsorships:
-            self.assertIn(sponsorship, qs)
+        with self.assertNumQueries(1):
+            qs_ids = ids(qs)
+
+        self.assertEqual(3, len(qs_ids))
+        self.assertLessEqual(ids(sponsorships), qs_ids)
 
     def test_init_form_from_sponsorship_benefit(self):
         benefit = baker.make(SponsorshipBenefit)
@@ -550,8 +570,11 @@ class SponsorContactFormTests(TestCase):
 
 class SendSponsorshipNotificationFormTests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.notification = baker.make("sponsors.SponsorEmailNotificationTemplate")
+
     def setUp(self):
-        self.notification = baker.make("sponsors.SponsorEmailNotificationTemplate")
         self.data = {
             "notification": self.notification.pk,
             "contact_types": [SponsorContact.MANAGER_CONTACT, SponsorContact.ADMINISTRATIVE_CONTACT],
@@ -592,24 +615,26 @@ class SendSponsorshipNotificationFormTests(TestCase):
         self.assertIsNone(notification.pk)
 
 
+@override_settings(DEFAULT_FILE_STORAGE="sponsors.tests.utils.InMemoryStorage")
 class SponsorRequiredAssetsFormTest(TestCase):
 
-    def setUp(self):
-        self.sponsorship = baker.make(Sponsorship, sponsor__name="foo")
-        self.required_text_cfg = baker.make(
+    @classmethod
+    def setUpTestData(cls):
+        cls.sponsorship = baker.make(Sponsorship, sponsor__name="foo")
+        cls.required_text_cfg = baker.make(
             RequiredTextAssetConfiguration,
             related_to=AssetsRelatedTo.SPONSORSHIP.value,
             internal_name="Text Input",
             _fill_optional=True,
         )
-        self.required_img_cfg = baker.make(
+        cls.required_img_cfg = baker.make(
             RequiredImgAssetConfiguration,
             related_to=AssetsRelatedTo.SPONSOR.value,
             internal_name="Image Input",
             _fill_optional=True,
         )
-        self.benefits = baker.make(
-            SponsorBenefit, sponsorship=self.sponsorship, _quantity=3
+        cls.benefits = baker.make(
+            SponsorBenefit, sponsorship=cls.sponsorship, _quantity=3, _bulk_create=True
         )
 
     def test_build_form_with_no_fields_if_no_required_asset(self):
@@ -4,7 +4,8 @@ from model_bakery import baker, seq
 from django import forms
 from django.conf import settings
 from django.core.mail import EmailMessage
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from ..models import (
@@ -20,7 +21,7 @@ from ..models import (
     SponsorshipPackage,
     TieredQuantity,
     TieredQuantityConfiguration, RequiredImgAssetConfiguration, RequiredImgAsset, ImgAsset,
-    RequiredTextAssetConfiguration, RequiredTextAsset, TextAsset
+    RequiredTextAssetConfiguration, RequiredTextAsset, TextAsset, EmailTargetableConfiguration
 )
 from ..exceptions import (
     SponsorWithExistingApplicationException,
@@ -29,6 +30,7 @@ from ..exceptions import (
 )
 from sponsors.models.enums import PublisherChoices, LogoPlacementChoices, AssetsRelatedTo
 from ..models.benefits import RequiredAssetMixin, BaseRequiredImgAsset, BenefitFeature, BaseRequiredTextAsset
+from ..models.sponsorship import get_targetable_email_benefits
 
 
 class SponsorshipBenefitModelTests(TestCase):
@@ -82,6 +84,56 @@ class SponsorshipBenefitModelTests(TestCase):
         self.assertTrue(benefit.has_tiers)
 
 
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TargetableEmailBenefitsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.benefit = baker.make(SponsorshipBenefit, name="Newsletter")
+        self.config = baker.make(EmailTargetableConfiguration, benefit=self.benefit)
+        baker.make(SponsorshipBenefit, name="Not targetable")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_cache_targetable_benefits_names_by_id(self):
+        expected = {str(self.benefit.pk): "Newsletter"}
+
+        with self.assertNumQueries(1):
+            self.assertEqual(expected, get_targetable_email_benefits())
+        with self.assertNumQueries(0):
+            self.assertEqual(expected, get_targetable_email_benefits())
+
+    def test_clear_cache_if_benefit_is_saved(self):
+        get_targetable_email_benefits()
+
+        self.benefit.name = "Blog post"
+        self.benefit.save()
+
+        self.assertEqual({str(self.benefit.pk): "Blog post"}, get_targetable_email_benefits())
+
+    def test_clear_cache_if_benefit_is_deleted(self):
+        get_targetable_email_benefits()
+
+        self.benefit.delete()
+
+        self.assertEqual({}, get_targetable_email_benefits())
+
+    def test_clear_cache_if_configuration_is_saved(self):
+        other_benefit = baker.make(SponsorshipBenefit, name="Social media")
+        get_targetable_email_benefits()
+
+        baker.make(EmailTargetableConfiguration, benefit=other_benefit)
+
+        self.assertIn(str(other_benefit.pk), get_targetable_email_benefits())
+
+    def test_clear_cache_if_configuration_is_deleted(self):
+        get_targetable_email_benefits()
+
+        self.config.delete()
+
+        self.assertEqual({}, get_targetable_email_benefits())
+
+
 class SponsorshipModelTests(TestCase):
     def setUp(self):
         self.benefits = baker.make(SponsorshipBenefit, _quantity=5, _fill_optional=True)
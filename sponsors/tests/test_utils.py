@@ -0,0 +1,34 @@
+from unittest.mock import patch, Mock
+
+from model_bakery import baker
+
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Sponsorship
+from ..utils import get_admin_url
+
+
+class GetAdminUrlTests(TestCase):
+
+    def test_same_url_as_reverse(self):
+        url_names = [
+            "admin:sponsors_contract_change",
+            "admin:sponsors_contract_preview",
+            "admin:sponsors_sponsorship_change",
+        ]
+        for name in url_names:
+            for pk in [1, 10, 42]:
+                with self.subTest(name=name, pk=pk):
+                    self.assertEqual(reverse(name, args=[pk]), get_admin_url(name, pk))
+
+    @patch("sponsors.utils._admin_url_template", Mock(return_value="/admin/contract-0"))
+    def test_fallback_to_reverse_if_pk_is_not_a_path_segment(self):
+        name = "admin:sponsors_contract_change"
+        self.assertEqual(reverse(name, args=[10]), get_admin_url(name, 10))
+
+    def test_contract_preview_url(self):
+        contract = baker.make_recipe("sponsors.tests.empty_contract", sponsorship=baker.make(Sponsorship))
+        self.assertEqual(
+            reverse("admin:sponsors_contract_preview", args=[contract.pk]), contract.preview_url
+        )
@@ -7,18 +7,20 @@ from datetime import date, timedelta
 from unittest.mock import patch, PropertyMock, Mock
 
 from django.conf import settings
-from django.contrib import messages
+from django.contrib import admin, messages
 from django.contrib.messages import get_messages
 from django.core import mail
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection
 from django.http import HttpResponse
 from django.test import TestCase, RequestFactory
-from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, resolve
 
 from .utils import assertMessage
 from ..models import Sponsorship, Contract, SponsorshipBenefit, SponsorBenefit, SponsorEmailNotificationTemplate
 from ..forms import SponsorshipReviewAdminForm, SponsorshipsListForm, SignedSponsorshipReviewAdminForm, SendSponsorshipNotificationForm
-from sponsors.views_admin import send_sponsorship_notifications_action
+from sponsors.views_admin import send_sponsorship_notifications_action, list_sponsorship_benefits_view
 from sponsors.use_cases import SendSponsorshipNotificationUseCase
 
 
@@ -874,6 +876,122 @@ class UpdateRelatedSponsorshipsTests(TestCase):
         self.assertRedirects(r, redirect_url, fetch_redirect_response=False)
 
 
+class ListSponsorshipBenefitsViewTests(TestCase):
+    def setUp(self):
+        self.user = baker.make(
+            settings.AUTH_USER_MODEL, is_staff=True, is_superuser=True
+        )
+        self.client.force_login(self.user)
+        self.sponsorship = baker.make(
+            Sponsorship, status=Sponsorship.FINALIZED, sponsor__name="Foo"
+        )
+        self.sponsor_benefits = baker.make(
+            SponsorBenefit, sponsorship=self.sponsorship, _quantity=2
+        )
+        self.url = reverse(
+            "admin:sponsors_sponsorship_benefits_partial", args=[self.sponsorship.pk]
+        )
+
+    def test_display_sponsorship_benefits(self):
+        other_benefit = baker.make(SponsorBenefit)
+
+        response = self.client.get(self.url)
+        context = response.context
+
+        self.assertTemplateUsed(response, "sponsors/admin/sponsorship_benefits_partial.html")
+        self.assertEqual(context["sponsorship"], self.sponsorship)
+        self.assertEqual(2, len(context["benefits"]))
+        for benefit in self.sponsor_benefits:
+            self.assertIn(benefit, context["benefits"])
+        self.assertNotIn(other_benefit, context["benefits"])
+
+    def test_number_of_queries_does_not_depend_on_number_of_benefits(self):
+        SponsorBenefit.objects.all().delete()
+        baker.make(
+            SponsorBenefit,
+            sponsorship=self.sponsorship,
+            sponsorship_benefit__program__name="PSF",
+        )
+        with CaptureQueriesContext(connection) as single_benefit:
+            self.client.get(self.url)
+
+        baker.make(
+            SponsorBenefit,
+            sponsorship=self.sponsorship,
+            sponsorship_benefit__program__name="PSF",
+            _quantity=3,
+        )
+        with self.assertNumQueries(len(single_benefit)):
+            response = self.client.get(self.url)
+
+        self.assertContains(response, "PSF &gt; ", count=4)
+
+    def test_fetch_sponsorship_and_benefits_only(self):
+        request = RequestFactory().get(self.url)
+        request.user = self.user
+        request.resolver_match = resolve(self.url)
+        model_admin = admin.site._registry[Sponsorship]
+
+        with CaptureQueriesContext(connection) as ctx:
+            list_sponsorship_benefits_view(model_admin, request, self.sponsorship.pk)
+
+        sql = [q["sql"] for q in ctx.captured_queries]
+        sponsorship_queries = [q for q in sql if q.endswith(f'"sponsors_sponsorship"."id" = {self.sponsorship.pk}')]
+        self.assertEqual(1, len(sponsorship_queries))
+        self.assertNotIn("JOIN", sponsorship_queries[0])
+        self.assertFalse([q for q in sql if q.startswith('SELECT "sponsors_sponsorcontact"')])
+
+    def test_change_form_lazy_loads_benefits_if_not_open_for_editing(self):
+        change_url = reverse(
+            "admin:sponsors_sponsorship_change", args=[self.sponsorship.pk]
+        )
+
+        response = self.client.get(change_url)
+
+        self.assertContains(response, f'data-url="{self.url}"')
+        self.assertContains(response, 'id="sponsor-benefits-error"')
+        formsets = [f.formset.prefix for f in response.context["inline_admin_formsets"]]
+        self.assertNotIn("benefits", formsets)
+
+    def test_change_form_with_benefits_inline_if_open_for_editing(self):
+        self.sponsorship.status = Sponsorship.APPLIED
+        self.sponsorship.save()
+        change_url = reverse(
+            "admin:sponsors_sponsorship_change", args=[self.sponsorship.pk]
+        )
+
+        response = self.client.get(change_url)
+
+        self.assertNotContains(response, self.url)
+        formsets = [f.formset.prefix for f in response.context["inline_admin_formsets"]]
+        self.assertIn("benefits", formsets)
+
+    def test_404_if_sponsorship_does_not_exist(self):
+        self.sponsorship.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_login_required(self):
+        login_url = reverse("admin:login")
+        redirect_url = f"{login_url}?next={self.url}"
+        self.client.logout()
+
+        r = self.client.get(self.url)
+
+        self.assertRedirects(r, redirect_url)
+
+    def test_staff_required(self):
+        login_url = reverse("admin:login")
+        redirect_url = f"{login_url}?next={self.url}"
+        self.user.is_staff = False
+        self.user.save()
+        self.client.force_login(self.user)
+
+        r = self.client.get(self.url)
+
+        self.assertRedirects(r, redirect_url, fetch_redirect_response=False)
+
+
 class PreviewContractViewTests(TestCase):
     def setUp(self):
         self.user = baker.make(
@@ -1,15 +1,24 @@
+from functools import lru_cache
 from pathlib import Path
 
 from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils.encoding import filepath_to_uri
 
 
-def get_static_image_file_as_upload(filename, upload_filename):
+@lru_cache(maxsize=None)
+def _read_static_image_bytes(filename):
     static_images_dir = Path(settings.STATICFILES_DIRS[0]) / "img"
     img = static_images_dir / filename
     assert img.exists(), f"File {img} does not exist"
-    with img.open("rb") as fd:
-        return SimpleUploadedFile(upload_filename, fd.read())
+    return img.read_bytes()
+
+
+def get_static_image_file_as_upload(filename, upload_filename):
+    # uploads keep their own file pointer, so only the content is shared
+    return SimpleUploadedFile(upload_filename, _read_static_image_bytes(filename))
 
 
 def assertMessage(msg, expected_content, expected_level):
@@ -17,3 +26,32 @@ def assertMessage(msg, expected_content, expected_level):
     assert (
         str(msg) == expected_content
     ), f"Message {msg} content is not {expected_content}"
+
+
+class InMemoryStorage(Storage):
+    """
+    Minimal file storage to be used with override_settings(DEFAULT_FILE_STORAGE=...)
+    by tests which upload files but don't care about them being written to disk
+    """
+
+    def __init__(self):
+        self._files = {}
+
+    def _open(self, name, mode="rb"):
+        return ContentFile(self._files[name], name=name)
+
+    def _save(self, name, content):
+        self._files[name] = b"".join(content.chunks())
+        return name
+
+    def exists(self, name):
+        return name in self._files
+
+    def delete(self, name):
+        self._files.pop(name, None)
+
+    def size(self, name):
+        return len(self._files[name])
+
+    def url(self, name):
+        return settings.MEDIA_URL + filepath_to_uri(name)
@@ -1,6 +1,8 @@
+from functools import lru_cache
 from pathlib import Path
 
 from django.core.files.storage import default_storage
+from django.urls import reverse
 
 
 def file_from_storage(filename, mode):
@@ -16,3 +18,20 @@ def file_from_storage(filename, mode):
         file = default_storage.open(filename, mode)
 
     return file
+
+
+@lru_cache(maxsize=16)
+def _admin_url_template(name):
+    return reverse(name, args=[0])
+
+
+def get_admin_url(name, pk):
+    """
+    Same as reverse(name, args=[pk]) for admin URLs with a single pk argument,
+    but the URLconf is only walked once per URL name
+    """
+    head, sep, tail = _admin_url_template(name).rpartition("/0/")
+    if not sep:
+        # the pk isn't a full path segment, so it can't be safely replaced
+        return reverse(name, args=[pk])
+    return f"{head}/{pk}/{tail}"
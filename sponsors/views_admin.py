@@ -234,6 +234,17 @@ def nullify_contract_view(ModelAdmin, request, pk):
     return render(request, "sponsors/admin/nullify_contract.html", context=context)
 
 
+def list_sponsorship_benefits_view(ModelAdmin, request, pk):
+    """
+    HTML fragment with the benefits of a sponsorship which isn't open for
+    editing anymore. The sponsorship change form lazy loads it.
+    """
+    sponsorship = get_object_or_404(Sponsorship, pk=pk)
+    benefits = sponsorship.benefits.select_related("sponsorship_benefit__program")
+    context = {"sponsorship": sponsorship, "benefits": benefits}
+    return render(request, "sponsors/admin/sponsorship_benefits_partial.html", context=context)
+
+
 @transaction.atomic
 def update_related_sponsorships(ModelAdmin, request, pk):
     """
@@ -285,8 +296,10 @@ def send_sponsorship_notifications_action(ModelAdmin, request, queryset):
         form = SendSponsorshipNotificationForm(request.POST)
         if form.is_valid():
             use_case = use_cases.SendSponsorshipNotificationUseCase.build()
+            # stream the sponsorships in chunks instead of loading all of them at once
+            sponsorships = queryset.select_related("sponsor", "package").iterator(chunk_size=500)
             kwargs = {
-                "sponsorships": queryset,
+                "sponsorships": sponsorships,
                 "notification": form.get_notification(),
                 "contact_types": form.cleaned_data["contact_types"],
                 "request": request,